@@ -1,3 +1,4 @@
 import os
 
-API_KEY = os.getenv('DIAL_API_KEY', '')
\ No newline at end of file
+API_KEY = os.getenv('DIAL_API_KEY', '')
+EMBEDDING_CACHE_CAPACITY = int(os.getenv('EMBEDDING_CACHE_CAPACITY', '10000'))
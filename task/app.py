@@ -1,7 +1,14 @@
-from task._constants import API_KEY
+import asyncio
+import io
+
+import tiktoken
+
+from task._constants import API_KEY, EMBEDDING_CACHE_CAPACITY
 from task.chat.chat_completion_client import DialChatCompletionClient
+from task.embeddings.cached_embeddings_client import CachedEmbeddingsClient
 from task.embeddings.embeddings_client import DialEmbeddingsClient
-from task.embeddings.text_processor import TextProcessor, SearchMode
+from task.embeddings.semantic_cache import SemanticQueryCache
+from task.embeddings.text_processor import TextProcessor, SearchMode, SearchProfile
 from task.models.conversation import Conversation
 from task.models.message import Message
 from task.models.role import Role
@@ -32,28 +39,38 @@ USER_PROMPT = """##RAG CONTEXT:
 ##USER QUESTION: 
 {query}"""
 
+# Max number of tokens of retrieved chunks added to `RAG CONTEXT`, keeps prompts (and LLM latency) bounded
+CONTEXT_TOKEN_BUDGET = 3000
+# Rough token size used when tiktoken encoding can't be loaded (it is downloaded on first use)
+CHARS_PER_TOKEN_ESTIMATE = 4
 
-# - create embeddings client with 'text-embedding-3-small-1' model
+
+# - create embeddings client with 'text-embedding-3-small-1' model (wrapped with LRU cache)
 # - create chat completion client
 # - create text processor, DB config: {'host': 'localhost','port': 5433,'database': 'vectordb','user': 'postgres','password': 'postgres'}
 # ---
 # Create method that will run console chat with such steps:
 # - get user input from console
 # - retrieve context
-# - perform augmentation
-# - perform generation
+# - perform augmentation (chunks are added to context until `CONTEXT_TOKEN_BUDGET` is reached)
+# - perform generation (streamed to console)
 # - it should run in `while` loop (since it is console chat)
 
 class MicrowaveRAG:
     def __init__(self):
-        self.embeddings_client = DialEmbeddingsClient(
-            deployment_name='text-embedding-3-small-1',
-            api_key=API_KEY
+        self.embeddings_client = CachedEmbeddingsClient(
+            client=DialEmbeddingsClient(
+                deployment_name='text-embedding-3-small-1',
+                api_key=API_KEY
+            ),
+            capacity=EMBEDDING_CACHE_CAPACITY
         )
         self.chat_client = DialChatCompletionClient(
             deployment_name='gpt-4o',
             api_key=API_KEY
         )
+        # Loaded lazily on first augmentation, `False` when it couldn't be loaded
+        self._encoding: tiktoken.Encoding | bool | None = None
         db_config = {
             'host': 'localhost',
             'port': 5433,
@@ -61,19 +78,53 @@ class MicrowaveRAG:
             'user': 'postgres',
             'password': 'postgres'
         }
-        self.text_processor = TextProcessor(self.embeddings_client, db_config)
+        self.text_processor = TextProcessor(self.embeddings_client, db_config, query_cache=SemanticQueryCache())
 
-    def run_console_chat(self):
-        print("Welcome to the Microwave RAG Assistant! Type 'exit' to quit.")
-        load_context = input("\nLoad context to VectorDB (y/n)? > ").strip()
-        if load_context.lower().strip() == 'y':
-            self.text_processor.process_text_file(
+    async def _load_context(self):
+        try:
+            await self.text_processor.aprocess_text_file(
                 file_name='embeddings/microwave_manual.txt',
                 chunk_size=400,
                 overlap=40,
                 dimensions=1536,
                 truncate_table=True
             )
+        finally:
+            await self.text_processor.aclose()
+
+    def _count_tokens(self, text: str) -> int:
+        if self._encoding is None:
+            try:
+                self._encoding = tiktoken.encoding_for_model('gpt-4o')
+            except Exception as e:
+                print(f"---Can't load tiktoken encoding ({e}), context size is estimated by characters---")
+                self._encoding = False
+
+        if self._encoding is False:
+            return len(text) // CHARS_PER_TOKEN_ESTIMATE + 1
+        return len(self._encoding.encode(text))
+
+    def _augment(self, context_chunks: list[str], query: str) -> str:
+        """Build `USER_PROMPT` with as many chunks as fit into `CONTEXT_TOKEN_BUDGET`"""
+        context = io.StringIO()
+
+        used_tokens = 0
+        for index, chunk in enumerate(context_chunks):
+            chunk_tokens = self._count_tokens(chunk)
+            if used_tokens + chunk_tokens > CONTEXT_TOKEN_BUDGET:
+                break
+            if index > 0:
+                context.write("\n\n")
+            context.write(chunk)
+            used_tokens += chunk_tokens
+
+        return USER_PROMPT.format(context=context.getvalue(), query=query)
+
+    def run_console_chat(self, profile: SearchProfile = SearchProfile.BALANCED):
+        print("Welcome to the Microwave RAG Assistant! Type 'exit' to quit.")
+        load_context = input("\nLoad context to VectorDB (y/n)? > ").strip()
+        if load_context.lower().strip() == 'y':
+            asyncio.run(self._load_context())
             print("=" * 100)
 
 
@@ -84,6 +135,7 @@ class MicrowaveRAG:
             user_input = input(">")
             if user_input.lower() == 'exit':
                 print("Exiting the chat. Goodbye!")
+                self.text_processor.close()
                 break
 
             # Retrieve context
@@ -92,20 +144,23 @@ class MicrowaveRAG:
                 user_request=user_input,
                 top_k=5,
                 score_threshold=0.01,
-                dimensions=1536
+                dimensions=1536,
+                profile=profile
             )
-            context = "\n\n".join(context_chunks)
 
             # Augment user input with context
-            augmented_user_input = USER_PROMPT.format(context=context, query=user_input)
+            augmented_user_input = self._augment(context_chunks, user_input)
             print(f"Augmented user input:\n{augmented_user_input}")
             conversation.add_message(Message(role=Role.USER, content=augmented_user_input))
 
-            # Generate response
-            response = self.chat_client.get_completion(conversation.get_messages(), True)
-            conversation.add_message(Message(role=Role.AI, content=response))
-
-            print(f"Assistant: {response.content}")
+            # Generate response, printing tokens as they arrive
+            print("Assistant: ", end="", flush=True)
+            content_parts = []
+            for token in self.chat_client.get_completion_stream(conversation.get_messages(), True):
+                print(token, end="", flush=True)
+                content_parts.append(token)
+            print()
+            conversation.add_message(Message(role=Role.AI, content="".join(content_parts)))
 
 if __name__ == "__main__":
     MicrowaveRAG.run_console_chat(self=MicrowaveRAG())
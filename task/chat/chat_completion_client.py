@@ -1,3 +1,6 @@
+import json
+from typing import Iterator
+
 import requests
 
 from task.models.message import Message
@@ -9,6 +12,7 @@ DIAL_CHAT_COMPLETION = 'https://ai-proxy.lab.epam.com/openai/deployments/{model}
 class DialChatCompletionClient:
     _endpoint: str
     _api_key: str
+    _session: requests.Session
 
     def __init__(self, deployment_name: str, api_key: str):
         if not api_key or api_key.strip() == "":
@@ -18,6 +22,8 @@ class DialChatCompletionClient:
             model=deployment_name
         )
         self._api_key = api_key
+        # Keep-alive session, so TCP/TLS handshake is not repeated on every conversation turn
+        self._session = requests.Session()
 
     def get_completion(
             self, messages: list[Message],
@@ -36,7 +42,7 @@ class DialChatCompletionClient:
             **kwargs,
         }
 
-        response = requests.post(url=self._endpoint, headers=headers, json=request_data, timeout=60)
+        response = self._session.post(url=self._endpoint, headers=headers, json=request_data, timeout=60)
 
         if response.status_code == 200:
             data = response.json()
@@ -48,6 +54,44 @@ class DialChatCompletionClient:
         else:
             raise Exception(f"HTTP {response.status_code}: {response.text}")
 
+    def get_completion_stream(
+            self, messages: list[Message],
+            print_request: bool = False,
+            **kwargs
+    ) -> Iterator[str]:
+        """Stream completion content as it is generated (SSE), yielding content deltas."""
+        if print_request:
+            print(f"Getting completion for `{self._get_messages_str(messages)}` \n\n ---And such parameters: {kwargs}---")
+
+        headers = {
+            "api-key": self._api_key,
+            "Content-Type": "application/json"
+        }
+        request_data = {
+            "messages": [msg.to_dict() for msg in messages],
+            **kwargs,
+            "stream": True,
+        }
+
+        with self._session.post(url=self._endpoint, headers=headers, json=request_data, timeout=60, stream=True) as response:
+            if response.status_code != 200:
+                raise Exception(f"HTTP {response.status_code}: {response.text}")
+
+            # SSE is UTF-8, requests would decode `text/event-stream` without charset as ISO-8859-1
+            for raw_line in response.iter_lines():
+                line = raw_line.decode("utf-8")
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+
+                choices = json.loads(data).get("choices", [])
+                if choices:
+                    content = choices[0].get("delta", {}).get("content")
+                    if content:
+                        yield content
+
     def _get_messages_str(self, messages: list[Message]) -> str:
         return "--------\n\n".join(
             [f"---Role: {message.role.upper()}---\n💬 Message: {message.content}" for message in messages]
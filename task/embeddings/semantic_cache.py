@@ -0,0 +1,78 @@
+import threading
+from typing import Hashable
+
+import numpy as np
+
+
+class SemanticQueryCache:
+    """In-memory cache of recent query embeddings and the context retrieved for them.
+
+    A lookup is one vectorized cosine-similarity pass over the stored rows; when the best match is above
+    `similarity_threshold` (and was retrieved with the same search parameters) its context is reused and
+    the vector DB round trip is skipped. Rows live in a preallocated (capacity x dimensions) ring buffer
+    with their norms, so once `capacity` is reached the oldest row is overwritten in place.
+    """
+
+    def __init__(self, capacity: int = 256, similarity_threshold: float = 0.97):
+        if capacity <= 0:
+            raise ValueError("Cache capacity must be positive")
+
+        self.capacity = capacity
+        self.similarity_threshold = similarity_threshold
+        # Allocated on first `put`, when the embedding dimension is known
+        self._recent_q_emb: np.ndarray | None = None
+        self._recent_norms: np.ndarray | None = None
+        self._recent_params: list[Hashable] = [None] * capacity
+        self._recent_ctx: list[list[str] | None] = [None] * capacity
+        self._size = 0
+        self._next = 0  # ring buffer slot written by the next `put`
+        self._lock = threading.Lock()
+
+    def get(self, query_embedding, params: Hashable) -> list[str] | None:
+        q = np.asarray(query_embedding, dtype=np.float32)
+        q_norm = np.linalg.norm(q)
+        with self._lock:
+            if self._size == 0 or q_norm == 0 or self._recent_q_emb.shape[1] != q.shape[0]:
+                return None
+
+            size = self._size
+            sims = (self._recent_q_emb[:size] @ q) / (self._recent_norms[:size] * q_norm)
+            mask = np.fromiter((p == params for p in self._recent_params[:size]), dtype=bool, count=size)
+            sims[~mask] = -np.inf
+
+            best = int(np.argmax(sims))
+            if sims[best] > self.similarity_threshold:
+                return self._recent_ctx[best]
+        return None
+
+    def put(self, query_embedding, params: Hashable, context_chunks: list[str]) -> None:
+        q = np.asarray(query_embedding, dtype=np.float32)
+        q_norm = np.linalg.norm(q)
+        if q_norm == 0:
+            return
+        with self._lock:
+            if self._recent_q_emb is None or self._recent_q_emb.shape[1] != q.shape[0]:
+                self._clear_locked()
+                self._recent_q_emb = np.empty((self.capacity, q.shape[0]), dtype=np.float32)
+                self._recent_norms = np.empty(self.capacity, dtype=np.float32)
+
+            slot = self._next
+            self._recent_q_emb[slot] = q
+            self._recent_norms[slot] = q_norm
+            self._recent_params[slot] = params
+            self._recent_ctx[slot] = context_chunks
+
+            self._next = (slot + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear_locked()
+
+    def _clear_locked(self) -> None:
+        self._recent_q_emb = None
+        self._recent_norms = None
+        self._recent_params = [None] * self.capacity
+        self._recent_ctx = [None] * self.capacity
+        self._size = 0
+        self._next = 0
@@ -1,11 +1,33 @@
+import asyncio
+import csv
+import io
+import itertools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from enum import StrEnum
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import aiohttp
+import asyncpg
+import numpy as np
+from psycopg2.extras import execute_values
 from psycopg2 import sql
+from psycopg2.pool import ThreadedConnectionPool
 
+from task.embeddings.cached_embeddings_client import CachedEmbeddingsClient
 from task.embeddings.embeddings_client import DialEmbeddingsClient
-from task.utils.text import chunk_text
+from task.embeddings.semantic_cache import SemanticQueryCache
+from task.utils.text import chunk_text, iter_chunks
+from task.utils.vector import to_pgvector_literal
+
+try:
+    from pgvector import Vector
+    from pgvector.psycopg2 import register_vector
+    from pgvector.asyncpg import register_vector as aregister_vector
+except ImportError:  # fall back to `to_pgvector_literal` text literals
+    Vector = None
+    register_vector = None
+    aregister_vector = None
 
 
 class SearchMode(StrEnum):
@@ -13,22 +35,127 @@ class SearchMode(StrEnum):
     COSINE_DISTANCE = "cosine"  # Cosine distance (<=>)
 
 
+# Searches order by the half-precision cast of `embedding`, so they use the halfvec HNSW indexes of
+# `init-scripts/init.sql` (see README for migrating a database created with full-precision indexes)
+EMBEDDING_DIMENSIONS = 1536
+# Number of half-precision candidates fetched per requested result before full-precision re-ranking
+RERANK_FACTOR = 4
+
+# Candidates come from the halfvec index and are re-ranked with full-precision distance.
+# Placeholders are `$n` both for asyncpg and for the server-side prepared statements used with psycopg2
+SEARCH_QUERY = """
+    SELECT text, embedding {operator} {embedding}::vector AS distance
+    FROM (
+        SELECT text, embedding
+        FROM vectors
+        ORDER BY embedding::halfvec({dimensions}) {operator} {embedding}::vector::halfvec({dimensions})
+        LIMIT {candidates}
+    ) AS candidates
+    ORDER BY distance
+    LIMIT {limit};
+"""
+
+# Batch k-NN: one lateral subquery per row of the `queries` VALUES table, filled by `execute_values`
+SEARCH_MANY_QUERY = """
+    SELECT queries.idx, nearest.text, nearest.distance
+    FROM (VALUES %s) AS queries (idx, embedding)
+    CROSS JOIN LATERAL (
+        SELECT text, embedding {operator} queries.embedding AS distance
+        FROM (
+            SELECT text, embedding
+            FROM vectors
+            ORDER BY embedding::halfvec({dimensions}) {operator} queries.embedding::halfvec({dimensions})
+            LIMIT {candidates}
+        ) AS candidates
+        ORDER BY distance
+        LIMIT {limit}
+    ) AS nearest
+    ORDER BY queries.idx, nearest.distance;
+"""
+
+
+class SearchProfile(StrEnum):
+    FAST = "fast"  # lowest latency, lower recall
+    BALANCED = "balanced"
+    RECALL_MAX = "recall-max"  # highest recall, slowest
+
+
+# `hnsw.ef_search` per profile: size of the candidate queue examined by HNSW at query time.
+# An HNSW scan returns at most `ef_search` rows, so it is raised to the re-rank pool (`top_k * RERANK_FACTOR`)
+# when that is larger, see `TextProcessor._ef_search`
+HNSW_EF_SEARCH = {
+    SearchProfile.FAST: 20,
+    SearchProfile.BALANCED: 40,
+    SearchProfile.RECALL_MAX: 100,
+}
+# Upper bound of `hnsw.ef_search` accepted by pgvector
+HNSW_EF_SEARCH_MAX = 1000
+
+
 class TextProcessor:
     """Processor for text documents that handles chunking, embedding, storing, and retrieval"""
 
-    def __init__(self, embeddings_client: DialEmbeddingsClient, db_config: dict):
+    def __init__(
+            self,
+            embeddings_client: DialEmbeddingsClient | CachedEmbeddingsClient,
+            db_config: dict,
+            query_cache: SemanticQueryCache | None = None,
+            max_connections: int = 8
+    ):
         self.embeddings_client = embeddings_client
         self.db_config = db_config
-
-    def _get_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(
+        self.query_cache = query_cache
+        self.max_connections = max_connections
+        self._apool: asyncpg.Pool | None = None
+        self._ahttp_session: aiohttp.ClientSession | None = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+        # Guards lazy creation of async resources; asyncio.Lock belongs to one event loop, so it is kept per loop
+        self._async_init_lock: asyncio.Lock | None = None
+        self._async_init_lock_loop: asyncio.AbstractEventLoop | None = None
+        # In-process copy of stored chunks for `search_local`, filled by `load_local_corpus`:
+        # L2-normalized float32 matrix (M x dimensions)
+        self._corpus_emb: np.ndarray | None = None
+        self._corpus_text: list[str] = []
+        # Names of search statements already PREPAREd on each pooled connection
+        self._prepared: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # psycopg2 closes returned connections once `minconn` are idle, so minconn == maxconn keeps all of them
+        # open (and their prepared statements) instead of reconnecting under concurrent use
+        self._pool = ThreadedConnectionPool(
+            max_connections,
+            max_connections,
             host=self.db_config['host'],
             port=self.db_config['port'],
             database=self.db_config['database'],
             user=self.db_config['user'],
             password=self.db_config['password']
         )
+        # Vector parameters are bound from numpy arrays instead of hand-built '[...]' strings
+        if register_vector is not None:
+            with self._get_connection() as conn:
+                register_vector(conn, globally=True)
+
+    @contextmanager
+    def _get_connection(self):
+        """Check a database connection out of the pool and return it when done.
+
+        Uncommitted work is rolled back by the pool on return, so connections are always handed back clean.
+        """
+        conn = self._pool.getconn()
+        try:
+            yield conn
+        finally:
+            self._pool.putconn(conn)
+
+    def close(self):
+        """Close all pooled database connections"""
+        self._pool.closeall()
+
+    @staticmethod
+    def _to_db_vector(vector):
+        """Convert embedding to query parameter: numpy array for the pgvector adapter, text literal otherwise"""
+        if register_vector is not None:
+            return np.asarray(vector, dtype=np.float32)
+        return to_pgvector_literal(vector)
 
     def _truncate_table(self, table_name: str = "vectors"):
         """Truncate the provided table name safely using SQL identifiers.
@@ -48,13 +175,25 @@ class TextProcessor:
     #   - load content from file and generate chunks (in `utils.text` present `chunk_text` that will help do that)
     #   - generate embeddings from chunks
     #   - save (insert) embeddings and chunks to DB
-    #       hint 1: embeddings should be saved as string list
-    #       hint 2: embeddings string list should be casted to vector ({embeddings}::vector)
-    def process_text_file(self, file_name: str, chunk_size: int, overlap: int, dimensions: int, truncate_table: bool):
+    #       hint 1: rows are written as in-memory CSV and loaded with `COPY ... FROM STDIN` in pages of `page_size` rows
+    #       hint 2: embeddings are written as `.7g` vector text literals (`to_pgvector_literal`), adapter or not
+    def process_text_file(
+            self,
+            file_name: str,
+            chunk_size: int,
+            overlap: int,
+            dimensions: int,
+            truncate_table: bool,
+            page_size: int = 500
+    ):
         if truncate_table:
             # Use the helper to truncate the vectors table
             self._truncate_table("vectors")
 
+        # Stored contents change, so previously retrieved contexts are no longer valid
+        if self.query_cache is not None:
+            self.query_cache.clear()
+
         with open(file_name, 'r', encoding='utf-8') as file:
             content = file.read()
 
@@ -63,15 +202,213 @@ class TextProcessor:
 
         with self._get_connection() as conn:
             with conn.cursor() as cursor:
-                for index, chunk in enumerate(chunks):
-                    embedding_vector = embeddings_dict[index]
-                    embedding_str = "[" + ",".join(map(str, embedding_vector)) + "]"
-                    cursor.execute(
-                        "INSERT INTO vectors (document_name, text, embedding) VALUES (%s, %s, %s::vector);",
-                        (file_name, chunk, embedding_str)
+                for start in range(0, len(chunks), page_size):
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer, lineterminator="\n")
+                    for index in range(start, min(start + page_size, len(chunks))):
+                        writer.writerow((file_name, chunks[index], to_pgvector_literal(embeddings_dict[index])))
+                    buffer.seek(0)
+                    cursor.copy_expert(
+                        "COPY vectors (document_name, text, embedding) FROM STDIN WITH (FORMAT csv);",
+                        buffer
                     )
             conn.commit()
 
+        # Loaded local corpus no longer matches stored chunks
+        self._clear_local_corpus()
+
+    async def _async_resources(self) -> tuple[asyncpg.Pool, aiohttp.ClientSession]:
+        """Get asyncpg pool (with pgvector codec) and aiohttp session bound to the running event loop"""
+        if aregister_vector is None:
+            raise RuntimeError("pgvector package is required for async database access")
+
+        loop = asyncio.get_running_loop()
+        if self._async_loop is loop:
+            return self._apool, self._ahttp_session
+
+        # No await between the check and the assignment, so concurrent callers of one loop share the lock
+        if self._async_init_lock_loop is not loop:
+            self._async_init_lock = asyncio.Lock()
+            self._async_init_lock_loop = loop
+
+        async with self._async_init_lock:
+            # Another caller may have created resources while this one was waiting for the lock
+            if self._async_loop is not loop:
+                # Resources of a previous (already finished) event loop can't be reused
+                self._apool = await asyncpg.create_pool(
+                    host=self.db_config['host'],
+                    port=self.db_config['port'],
+                    database=self.db_config['database'],
+                    user=self.db_config['user'],
+                    password=self.db_config['password'],
+                    min_size=1,
+                    max_size=self.max_connections,
+                    init=aregister_vector
+                )
+                self._ahttp_session = aiohttp.ClientSession()
+                self._async_loop = loop
+
+        return self._apool, self._ahttp_session
+
+    async def aclose(self):
+        """Close async database pool and HTTP session of the running event loop"""
+        if self._async_loop is asyncio.get_running_loop():
+            await self._apool.close()
+            await self._ahttp_session.close()
+        self._apool = None
+        self._ahttp_session = None
+        self._async_loop = None
+
+    # provide method `aprocess_text_file`, streaming version of `process_text_file`:
+    #   - producer slices chunks lazily and puts batches of `batch_size` chunks into a bounded queue
+    #   - `embeddings_client.max_workers` embedders take chunk batches concurrently, embed them and pass
+    #     (chunks, embeddings) to the next bounded queue (batches may be inserted out of order)
+    #   - inserter writes every batch with binary COPY (`copy_records_to_table`)
+    #   - up to `max_workers` embedding API calls are in flight at once (as in `get_embeddings`), and they overlap
+    #     with chunking and with COPY of already embedded batches; apart from the file content itself
+    #     (and chunk offsets) at most `queue_size` batches of chunks and of vectors are queued, plus one per embedder
+    #   - table is truncated and committed first (as in `process_text_file`), so searches aren't blocked by
+    #     TRUNCATE lock during the ingest; all batches are committed together at the end
+    async def aprocess_text_file(
+            self,
+            file_name: str,
+            chunk_size: int,
+            overlap: int,
+            dimensions: int,
+            truncate_table: bool,
+            batch_size: int = 96,
+            queue_size: int = 4
+    ):
+        with open(file_name, 'r', encoding='utf-8') as file:
+            content = file.read()
+
+        embed_workers = self.embeddings_client.max_workers
+        chunk_queue: asyncio.Queue[list[str] | None] = asyncio.Queue(maxsize=queue_size)
+        record_queue: asyncio.Queue[list[tuple] | None] = asyncio.Queue(maxsize=queue_size)
+        running_embedders = embed_workers
+
+        async def produce():
+            chunks = iter_chunks(content, chunk_size, overlap)
+            while batch := list(itertools.islice(chunks, batch_size)):
+                await chunk_queue.put(batch)
+            # One end marker per embedder
+            for _ in range(embed_workers):
+                await chunk_queue.put(None)
+
+        async def embed(session: aiohttp.ClientSession):
+            nonlocal running_embedders
+            while (chunks := await chunk_queue.get()) is not None:
+                embeddings_dict = await self.embeddings_client.aget_embeddings(chunks, dimensions, session)
+                await record_queue.put([
+                    (file_name, chunk, np.asarray(embeddings_dict[index], dtype=np.float32))
+                    for index, chunk in enumerate(chunks)
+                ])
+            # The last embedder to finish tells the inserter that no more records follow
+            running_embedders -= 1
+            if running_embedders == 0:
+                await record_queue.put(None)
+
+        async def insert(conn: asyncpg.Connection):
+            while (records := await record_queue.get()) is not None:
+                await conn.copy_records_to_table(
+                    'vectors',
+                    records=records,
+                    columns=['document_name', 'text', 'embedding']
+                )
+
+        pool, session = await self._async_resources()
+        async with pool.acquire() as conn:
+            if truncate_table:
+                # Runs outside the transaction below (autocommit), ACCESS EXCLUSIVE lock is released right away
+                await conn.execute("TRUNCATE TABLE vectors;")
+
+            async with conn.transaction():
+                async with asyncio.TaskGroup() as group:
+                    group.create_task(produce())
+                    for _ in range(embed_workers):
+                        group.create_task(embed(session))
+                    group.create_task(insert(conn))
+
+        # Stored contents change, so previously retrieved contexts are no longer valid
+        if self.query_cache is not None:
+            self.query_cache.clear()
+
+        # Loaded local corpus no longer matches stored chunks
+        self._clear_local_corpus()
+
+    def _clear_local_corpus(self):
+        self._corpus_emb = None
+        self._corpus_text = []
+
+    def load_local_corpus(self):
+        """Load all stored chunks from DB into the in-process corpus used by `search_local`.
+
+        Opt-in: called by the first `search_local`, the M x dimensions float32 matrix is then kept in memory
+        until the next ingest clears it (the following `search_local` loads it again).
+        """
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT text, embedding FROM vectors ORDER BY id;")
+                rows = cursor.fetchall()
+
+        if not rows:
+            self._clear_local_corpus()
+            return
+
+        emb = np.vstack([self._from_db_vector(embedding) for _, embedding in rows]).astype(np.float32)
+        norms = np.linalg.norm(emb, axis=1, keepdims=True)
+        emb /= np.where(norms == 0, 1.0, norms)
+
+        self._corpus_emb = emb
+        self._corpus_text = [text for text, _ in rows]
+
+    @staticmethod
+    def _from_db_vector(embedding) -> np.ndarray:
+        """Convert fetched `vector` value to numpy array: pgvector `Vector` with the adapter, '[...]' text without"""
+        if Vector is not None and isinstance(embedding, Vector):
+            return embedding.to_numpy()
+        if isinstance(embedding, str):
+            return np.asarray(embedding.strip("[]").split(","), dtype=np.float32)
+        return np.asarray(embedding, dtype=np.float32)
+
+    # provide method `search_local`, in-process alternative of `search` for small corpora:
+    #   - works on the corpus loaded by `load_local_corpus`, loaded on first use (and after each ingest clears it)
+    #   - corpus embeddings are kept as L2-normalized float32 matrix, so cosine similarity is one matrix-vector product
+    #   - top k is selected with `argpartition` and only those are sorted
+    #   - `score_threshold` is min cosine similarity
+    def search_local(self, user_request: str, top_k: int, dimensions: int, score_threshold: float = 0.0) -> list[str]:
+        if self._corpus_emb is None:
+            self.load_local_corpus()
+        if self._corpus_emb is None:
+            # Table is empty
+            return []
+
+        request_embedding_dict = self.embeddings_client.get_embeddings(user_request, dimensions)
+        q = np.asarray(request_embedding_dict[0], dtype=np.float32)
+        q_norm = np.linalg.norm(q)
+        if q_norm == 0:
+            return []
+
+        scores = self._corpus_emb @ (q / q_norm)
+
+        k = min(top_k, scores.shape[0])
+        if k <= 0:
+            return []
+        top_indices = np.argpartition(-scores, k - 1)[:k]
+        top_indices = top_indices[np.argsort(-scores[top_indices])]
+
+        retrieved_chunks = []
+        for index in top_indices:
+            similarity = float(scores[index])
+            if similarity < score_threshold:
+                break
+
+            print(f"---Similarity score: {similarity:.2f}---")
+            print(f"Data: {self._corpus_text[index]}\n")
+            retrieved_chunks.append(self._corpus_text[index])
+
+        return retrieved_chunks
+
     # provide method `search` that will:
     #   - apply search mode, user request, top k for search, min score threshold and dimensions
     #   - generate embeddings from user request
@@ -79,43 +416,223 @@ class TextProcessor:
     #     hint 1: to search it in DB you need to create just regular select query
     #     hint 2: Euclidean distance `<->`, Cosine distance `<=>`
     #     hint 3: You need to extract `text` from `vectors` table
-    #     hint 4: You need to filter distance in WHERE clause
+    #     hint 4: Only `ORDER BY distance LIMIT k` can use the HNSW index, so the distance threshold
+    #             is applied in Python after fetching instead of in a WHERE clause
     #     hint 5: To get top k use `limit`
-    def search(self, search_mode: SearchMode, user_request: str, top_k: int, score_threshold: float, dimensions: int) -> list[str]:
+    #     hint 6: search profile trades recall for latency via `hnsw.ef_search`
+    #     hint 7: candidates come from the halfvec index and are re-ranked with full-precision distance
+    #   - paraphrases of recent queries (cosine similarity above the cache threshold) reuse the cached context
+    def search(
+            self,
+            search_mode: SearchMode,
+            user_request: str,
+            top_k: int,
+            score_threshold: float,
+            dimensions: int,
+            profile: SearchProfile = SearchProfile.BALANCED
+    ) -> list[str]:
         request_embedding_dict = self.embeddings_client.get_embeddings(user_request, dimensions)
         request_embedding_vector = request_embedding_dict[0]
-        request_embedding_str = "[" + ",".join(map(str, request_embedding_vector)) + "]"
 
+        cache_params = (search_mode, top_k, score_threshold, dimensions, profile)
+        cached_chunks = self._get_cached(request_embedding_vector, cache_params)
+        if cached_chunks is not None:
+            return cached_chunks
+
+        results = self._fetch_nearest(search_mode, request_embedding_vector, top_k, profile)
+
+        retrieved_chunks = self._filter_results(search_mode, results, score_threshold)
+        if self.query_cache is not None:
+            self.query_cache.put(request_embedding_vector, cache_params, retrieved_chunks)
+
+        return retrieved_chunks
+
+    # provide method `search_many` that will:
+    #   - embed all user requests with one embeddings call
+    #   - with `lateral=True` fetch top k for every request with one `JOIN LATERAL` query (one DB round trip)
+    #   - with `lateral=False` run single-request queries in parallel on pooled connections
+    #     (pgvector plans each lateral subquery separately, so parallel queries may still win on wall-clock)
+    #   - return retrieved chunks per request, in the order of `user_requests`
+    def search_many(
+            self,
+            search_mode: SearchMode,
+            user_requests: list[str],
+            top_k: int,
+            score_threshold: float,
+            dimensions: int,
+            profile: SearchProfile = SearchProfile.BALANCED,
+            lateral: bool = True
+    ) -> list[list[str]]:
+        if not user_requests:
+            return []
+
+        request_embedding_dict = self.embeddings_client.get_embeddings(user_requests, dimensions)
+        request_embedding_vectors = [request_embedding_dict[index] for index in range(len(user_requests))]
+
+        if lateral:
+            results = self._fetch_nearest_many(search_mode, request_embedding_vectors, top_k, profile)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_connections, len(user_requests))) as executor:
+                results = list(executor.map(
+                    lambda vector: self._fetch_nearest(search_mode, vector, top_k, profile),
+                    request_embedding_vectors
+                ))
+
+        return [self._filter_results(search_mode, rows, score_threshold) for rows in results]
+
+    def _fetch_nearest(
+            self,
+            search_mode: SearchMode,
+            embedding_vector,
+            top_k: int,
+            profile: SearchProfile
+    ) -> list[tuple[str, float]]:
+        """Fetch (text, distance) rows of the `top_k` nearest chunks"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                statement = self._prepare_search(conn, cursor, search_mode)
+                cursor.execute("SET LOCAL hnsw.ef_search = %s;", (self._ef_search(profile, top_k),))
+                cursor.execute(
+                    sql.SQL("EXECUTE {} (%s, %s, %s);").format(sql.Identifier(statement)),
+                    (self._to_db_vector(embedding_vector), top_k * RERANK_FACTOR, top_k)
+                )
+                # Rows are plain (text, distance) tuples
+                return cursor.fetchall()
+
+    def _prepare_search(self, conn, cursor, search_mode: SearchMode) -> str:
+        """PREPARE search statement for the mode once per connection, so parse and plan are not repeated per query"""
+        statement = f"search_{search_mode.value}"
+        prepared = self._prepared.setdefault(conn, set())
+        if statement not in prepared:
+            cursor.execute(
+                sql.SQL("PREPARE {} (vector, int, int) AS {}").format(
+                    sql.Identifier(statement),
+                    sql.SQL(self._search_query(search_mode, embedding="$1", candidates="$2", limit="$3"))
+                )
+            )
+            prepared.add(statement)
+        return statement
+
+    def _fetch_nearest_many(
+            self,
+            search_mode: SearchMode,
+            embedding_vectors: list,
+            top_k: int,
+            profile: SearchProfile
+    ) -> list[list[tuple[str, float]]]:
+        """Fetch (text, distance) rows of the `top_k` nearest chunks for every embedding with one query"""
+        query = SEARCH_MANY_QUERY.format(
+            operator="<->" if search_mode == SearchMode.EUCLIDIAN_DISTANCE else "<=>",
+            dimensions=EMBEDDING_DIMENSIONS,
+            candidates=int(top_k * RERANK_FACTOR),
+            limit=int(top_k)
+        )
+
+        results = [[] for _ in embedding_vectors]
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SET LOCAL hnsw.ef_search = %s;", (self._ef_search(profile, top_k),))
+                rows = execute_values(
+                    cursor,
+                    query,
+                    [(index, self._to_db_vector(vector)) for index, vector in enumerate(embedding_vectors)],
+                    template="(%s, %s::vector)",
+                    page_size=len(embedding_vectors),
+                    fetch=True
+                )
+
+        for index, text, distance in rows:
+            results[index].append((text, distance))
+
+        return results
+
+    # provide method `asearch`, asyncio (aiohttp + asyncpg) version of `search`
+    async def asearch(
+            self,
+            search_mode: SearchMode,
+            user_request: str,
+            top_k: int,
+            score_threshold: float,
+            dimensions: int,
+            profile: SearchProfile = SearchProfile.BALANCED
+    ) -> list[str]:
+        pool, session = await self._async_resources()
+
+        request_embedding_dict = await self.embeddings_client.aget_embeddings(user_request, dimensions, session)
+        request_embedding_vector = request_embedding_dict[0]
+
+        cache_params = (search_mode, top_k, score_threshold, dimensions, profile)
+        cached_chunks = self._get_cached(request_embedding_vector, cache_params)
+        if cached_chunks is not None:
+            return cached_chunks
+
+        query = self._search_query(search_mode, embedding="$1", candidates="$2", limit="$3")
+
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                # SET doesn't accept bind parameters, set_config(..., is_local => true) is SET LOCAL equivalent
+                await conn.execute(
+                    "SELECT set_config('hnsw.ef_search', $1, true);",
+                    str(self._ef_search(profile, top_k))
+                )
+                results = await conn.fetch(
+                    query,
+                    np.asarray(request_embedding_vector, dtype=np.float32),
+                    top_k * RERANK_FACTOR,
+                    top_k
+                )
+
+        retrieved_chunks = self._filter_results(search_mode, results, score_threshold)
+        if self.query_cache is not None:
+            self.query_cache.put(request_embedding_vector, cache_params, retrieved_chunks)
+
+        return retrieved_chunks
+
+    def _get_cached(self, request_embedding_vector, cache_params) -> list[str] | None:
+        if self.query_cache is None:
+            return None
+
+        cached_chunks = self.query_cache.get(request_embedding_vector, cache_params)
+        if cached_chunks is not None:
+            print("---Context served from semantic query cache---")
+        return cached_chunks
+
+    @staticmethod
+    def _ef_search(profile: SearchProfile, top_k: int) -> int:
+        """`hnsw.ef_search` for the profile, at least the number of re-rank candidates requested from the index"""
+        return min(max(HNSW_EF_SEARCH[profile], top_k * RERANK_FACTOR), HNSW_EF_SEARCH_MAX)
+
+    @staticmethod
+    def _search_query(search_mode: SearchMode, embedding: str, candidates: str, limit: str) -> str:
         distance_operator = "<->" if search_mode == SearchMode.EUCLIDIAN_DISTANCE else "<=>"
+        return SEARCH_QUERY.format(
+            operator=distance_operator,
+            dimensions=EMBEDDING_DIMENSIONS,
+            embedding=embedding,
+            candidates=candidates,
+            limit=limit
+        )
 
+    @staticmethod
+    def _filter_results(search_mode: SearchMode, results, score_threshold: float) -> list[str]:
+        """Drop (text, distance) rows below the score threshold and return texts of the rest"""
         if search_mode == SearchMode.COSINE_DISTANCE:
             max_distance = 1.0 - score_threshold
         else:
             max_distance = float('inf') if score_threshold == 0 else (1.0 / score_threshold) - 1.0
 
-        query = f"""
-            SELECT text, embedding {distance_operator} %s::vector AS distance
-            FROM vectors
-            WHERE embedding {distance_operator} %s::vector < %s
-            ORDER BY distance
-            LIMIT %s;
-        """
-
-        results = []
-        with self._get_connection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, (request_embedding_str, request_embedding_str, max_distance, top_k))
-                results = cursor.fetchall()
-
         retrieved_chunks = []
-        for row in results:
+        for text, distance in results:
+            if distance >= max_distance:
+                continue
+
             if search_mode == SearchMode.COSINE_DISTANCE:
-                similarity = 1.0 - row['distance']
+                similarity = 1.0 - distance
             else:
-                similarity = 1.0 / (1.0 + row['distance'])
+                similarity = 1.0 / (1.0 + distance)
 
             print(f"---Similarity score: {similarity:.2f}---")
-            print(f"Data: {row['text']}\n")
-            retrieved_chunks.append(row['text'])
+            print(f"Data: {text}\n")
+            retrieved_chunks.append(text)
 
         return retrieved_chunks
@@ -1,31 +1,63 @@
+from typing import Iterator
 
+import numpy as np
 
-def chunk_text(text: str, chunk_size: int, overlap: int) -> list[str]:
+try:
+    from numba import njit
+except ImportError:  # run offsets loop as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+@njit(cache=True)
+def _chunk_offsets(text_length: int, chunk_size: int, overlap: int) -> np.ndarray:
+    """Compute (start, end) positions of overlapping chunks, shape (M, 2)"""
+    max_chunks = text_length // (chunk_size - overlap) + 2
+    offsets = np.empty((max_chunks, 2), dtype=np.int64)
+
+    count = 0
+    current_position = 0
+    while current_position < text_length:
+        end_position = min(current_position + chunk_size, text_length)
+        offsets[count, 0] = current_position
+        offsets[count, 1] = end_position
+        count += 1
+
+        current_position = end_position - overlap
+
+        if current_position >= text_length - overlap and end_position == text_length:
+            break
+
+    return offsets[:count]
+
+
+def iter_chunks(text: str, chunk_size: int, overlap: int) -> Iterator[str]:
     """
-    Split text into chunks with overlap
-    Example: For text "Hello World Programming" with chunk_size=8 and overlap=3:
-        Chunk 1: "Hello Wo" (positions 0-7)
-        Chunk 2: "o World " (positions 5-12, overlapping "o W")
-        Chunk 3: "ld Progr" (positions 10-17, overlapping "ld ")
-        And so on...
+    Lazy version of `chunk_text`: only (start, end) positions are computed up front (16 bytes per chunk),
+    chunk strings are sliced as they are consumed
     """
     if not text:
-        return []
+        return
 
     if len(text) <= chunk_size:
-        return [text]
-
-    chunks = []
-    current_position = 0
+        yield text
+        return
 
-    while current_position < len(text):
-        end_position = min(current_position + chunk_size, len(text))
-        chunk = text[current_position:end_position]
-        chunks.append(chunk)
+    if overlap >= chunk_size:
+        raise ValueError("Overlap must be smaller than chunk size")
 
-        current_position = end_position - overlap
+    for start, end in _chunk_offsets(len(text), chunk_size, overlap).tolist():
+        yield text[start:end]
 
-        if current_position >= len(text) - overlap and end_position == len(text):
-            break
 
-    return chunks
\ No newline at end of file
+def chunk_text(text: str, chunk_size: int, overlap: int) -> list[str]:
+    """
+    Split text into chunks with overlap
+    Example: For text "Hello World Programming" with chunk_size=8 and overlap=3:
+        Chunk 1: "Hello Wo" (positions 0-7)
+        Chunk 2: "o World " (positions 5-12, overlapping "o W")
+        Chunk 3: "ld Progr" (positions 10-17, overlapping "ld ")
+        And so on...
+    Chunk positions are computed by compiled (Numba) loop, text is sliced once per chunk
+    """
+    return list(iter_chunks(text, chunk_size, overlap))
@@ -0,0 +1,11 @@
+import numpy as np
+
+
+def to_pgvector_literal(vector) -> str:
+    """
+    Format embedding vector as pgvector text literal, e.g. "[0.1968669,-0.0123]"
+    Values are written with `.7g` (float32 precision, fewer bytes than `str(float)`); plain lists (as returned by
+    the embeddings API) are formatted as is, without a round trip through numpy
+    """
+    values = vector.tolist() if isinstance(vector, np.ndarray) else vector
+    return f"[{','.join([f'{value:.7g}' for value in values])}]"
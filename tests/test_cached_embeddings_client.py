@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from task.embeddings.cached_embeddings_client import CachedEmbeddingsClient
+
+
+class FakeEmbeddingsClient:
+    """Returns [len(text), dimensions] per text and records every input list it was called with"""
+
+    deployment_name = "fake-embeddings"
+    max_workers = 8
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def get_embeddings(self, input_list, dimensions):
+        self.calls.append(list(input_list))
+        return {index: [float(len(text)), float(dimensions)] for index, text in enumerate(input_list)}
+
+    async def aget_embeddings(self, input_list, dimensions, session=None):
+        return self.get_embeddings(input_list, dimensions)
+
+
+def test_only_misses_are_embedded():
+    inner = FakeEmbeddingsClient()
+    client = CachedEmbeddingsClient(inner)
+
+    assert client.get_embeddings(["a", "bb"], 3) == {0: [1.0, 3.0], 1: [2.0, 3.0]}
+    assert client.get_embeddings(["ccc", "a", "bb", "dddd"], 3) == {
+        0: [3.0, 3.0], 1: [1.0, 3.0], 2: [2.0, 3.0], 3: [4.0, 3.0]
+    }
+    assert inner.calls == [["a", "bb"], ["ccc", "dddd"]]
+
+
+def test_string_input_and_full_hit():
+    inner = FakeEmbeddingsClient()
+    client = CachedEmbeddingsClient(inner)
+
+    assert client.get_embeddings("query", 3) == {0: [5.0, 3.0]}
+    assert client.get_embeddings("query", 3) == {0: [5.0, 3.0]}
+    assert inner.calls == [["query"]]
+
+
+def test_dimensions_are_part_of_the_key():
+    inner = FakeEmbeddingsClient()
+    client = CachedEmbeddingsClient(inner)
+
+    client.get_embeddings(["a"], 3)
+    assert client.get_embeddings(["a"], 4) == {0: [1.0, 4.0]}
+    assert inner.calls == [["a"], ["a"]]
+
+
+def test_least_recently_used_is_evicted():
+    inner = FakeEmbeddingsClient()
+    client = CachedEmbeddingsClient(inner, capacity=2)
+
+    client.get_embeddings(["a", "b"], 3)
+    client.get_embeddings(["a"], 3)  # "b" is now least recently used
+    client.get_embeddings(["c"], 3)
+    client.get_embeddings(["a", "b"], 3)
+    assert inner.calls == [["a", "b"], ["c"], ["b"]]
+
+
+def test_async_path_shares_the_cache():
+    inner = FakeEmbeddingsClient()
+    client = CachedEmbeddingsClient(inner)
+
+    client.get_embeddings(["a"], 3)
+    assert asyncio.run(client.aget_embeddings(["a", "bb"], 3)) == {0: [1.0, 3.0], 1: [2.0, 3.0]}
+    assert inner.calls == [["a"], ["bb"]]
+
+
+def test_exposes_wrapped_client_settings():
+    client = CachedEmbeddingsClient(FakeEmbeddingsClient())
+    assert client.deployment_name == "fake-embeddings"
+    assert client.max_workers == 8
+
+
+def test_non_positive_capacity_raises():
+    with pytest.raises(ValueError):
+        CachedEmbeddingsClient(FakeEmbeddingsClient(), capacity=0)
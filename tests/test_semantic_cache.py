@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from task.embeddings.semantic_cache import SemanticQueryCache
+
+PARAMS = ("cosine", 5, 0.5, 4, "balanced")
+
+
+def unit(index: int, dim: int = 4) -> np.ndarray:
+    vector = np.zeros(dim, dtype=np.float32)
+    vector[index] = 1.0
+    return vector
+
+
+def test_near_duplicate_hits_and_distinct_query_misses():
+    cache = SemanticQueryCache()
+    cache.put([1.0, 0.0, 0.0, 0.0], PARAMS, ["ctx"])
+
+    assert cache.get([0.99, 0.01, 0.0, 0.0], PARAMS) == ["ctx"]
+    assert cache.get([0.0, 1.0, 0.0, 0.0], PARAMS) is None
+
+
+def test_similarity_is_scale_invariant():
+    cache = SemanticQueryCache()
+    cache.put([2.0, 0.0, 0.0, 0.0], PARAMS, ["ctx"])
+
+    assert cache.get([0.5, 0.0, 0.0, 0.0], PARAMS) == ["ctx"]
+
+
+def test_search_params_must_match():
+    cache = SemanticQueryCache()
+    cache.put(unit(0), PARAMS, ["ctx"])
+
+    assert cache.get(unit(0), PARAMS[:-1] + ("fast",)) is None
+
+
+def test_best_match_wins():
+    cache = SemanticQueryCache(similarity_threshold=0.9)
+    cache.put([1.0, 0.3, 0.0, 0.0], PARAMS, ["further"])
+    cache.put([1.0, 0.05, 0.0, 0.0], PARAMS, ["closer"])
+
+    assert cache.get(unit(0), PARAMS) == ["closer"]
+
+
+def test_oldest_entries_are_evicted():
+    cache = SemanticQueryCache(capacity=3)
+    for index in range(5):
+        cache.put(unit(index, dim=8), PARAMS, [f"ctx{index}"])
+
+    assert cache.get(unit(0, dim=8), PARAMS) is None
+    assert cache.get(unit(1, dim=8), PARAMS) is None
+    for index in range(2, 5):
+        assert cache.get(unit(index, dim=8), PARAMS) == [f"ctx{index}"]
+
+
+def test_zero_vectors_and_dimension_change():
+    cache = SemanticQueryCache()
+    cache.put([0.0, 0.0, 0.0, 0.0], PARAMS, ["zero"])
+    assert cache.get(unit(0), PARAMS) is None
+    assert cache.get([0.0, 0.0, 0.0, 0.0], PARAMS) is None
+
+    cache.put(unit(0), PARAMS, ["4d"])
+    assert cache.get(unit(0, dim=8), PARAMS) is None
+
+    # Entries with another dimension are dropped
+    cache.put(unit(0, dim=8), PARAMS, ["8d"])
+    assert cache.get(unit(0, dim=8), PARAMS) == ["8d"]
+    assert cache.get(unit(0), PARAMS) is None
+
+
+def test_clear():
+    cache = SemanticQueryCache()
+    cache.put(unit(0), PARAMS, ["ctx"])
+    cache.clear()
+
+    assert cache.get(unit(0), PARAMS) is None
+
+
+def test_non_positive_capacity_raises():
+    with pytest.raises(ValueError):
+        SemanticQueryCache(capacity=0)
@@ -0,0 +1,74 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from task.utils.text import chunk_text, iter_chunks
+
+MANUAL = Path(__file__).parent.parent / "task" / "embeddings" / "microwave_manual.txt"
+
+
+def reference_chunk_text(text: str, chunk_size: int, overlap: int) -> list[str]:
+    """Pure-Python chunker `chunk_text` was ported from"""
+    if not text:
+        return []
+
+    if len(text) <= chunk_size:
+        return [text]
+
+    chunks = []
+    current_position = 0
+
+    while current_position < len(text):
+        end_position = min(current_position + chunk_size, len(text))
+        chunks.append(text[current_position:end_position])
+
+        current_position = end_position - overlap
+
+        if current_position >= len(text) - overlap and end_position == len(text):
+            break
+
+    return chunks
+
+
+def test_overlapping_chunks():
+    assert chunk_text("Hello World Programming", 8, 3) == ["Hello Wo", " World P", "d Progra", "gramming"]
+
+
+def test_empty_and_short_text():
+    assert chunk_text("", 10, 2) == []
+    assert chunk_text("short", 10, 2) == ["short"]
+    assert chunk_text("exactly10!", 10, 2) == ["exactly10!"]
+
+
+@pytest.mark.parametrize("chunk_size, overlap", [(150, 40), (300, 40), (300, 0), (50, 49)])
+def test_manual_matches_reference(chunk_size, overlap):
+    content = MANUAL.read_text(encoding="utf-8")
+    assert chunk_text(content, chunk_size, overlap) == reference_chunk_text(content, chunk_size, overlap)
+
+
+def test_random_inputs_match_reference():
+    rng = random.Random(0)
+    for _ in range(3000):
+        text = "".join(rng.choices("ab c\n", k=rng.randint(0, 400)))
+        chunk_size = rng.randint(1, 60)
+        overlap = rng.randint(0, chunk_size - 1)
+        assert chunk_text(text, chunk_size, overlap) == reference_chunk_text(text, chunk_size, overlap)
+
+
+def test_smallest_step_fits_offsets_buffer():
+    # chunk_size - overlap == 1 produces the most chunks per character
+    text = "x" * 1000
+    assert chunk_text(text, 5, 4) == reference_chunk_text(text, 5, 4)
+
+
+def test_overlap_not_smaller_than_chunk_size_raises():
+    with pytest.raises(ValueError):
+        chunk_text("a" * 20, 5, 5)
+    with pytest.raises(ValueError):
+        chunk_text("a" * 20, 5, 7)
+
+
+def test_iter_chunks_is_lazy():
+    chunks = iter_chunks("a" * 100, 10, 2)
+    assert next(chunks) == "a" * 10
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from task.utils.vector import to_pgvector_literal
+
+
+def test_list_literal():
+    assert to_pgvector_literal([0.19686688482761383, -0.0123, 0.0, 3]) == "[0.1968669,-0.0123,0,3]"
+
+
+def test_numpy_literal():
+    assert to_pgvector_literal(np.array([0.5, -2.0, 1e-9], dtype=np.float32)) == "[0.5,-2,1e-09]"
+
+
+def test_empty_vector():
+    assert to_pgvector_literal([]) == "[]"
+
+
+def test_round_trips_at_float32_precision():
+    vector = np.random.default_rng(0).standard_normal(1536).astype(np.float32)
+    literal = to_pgvector_literal(vector.tolist())
+
+    parsed = np.asarray(literal.strip("[]").split(","), dtype=np.float32)
+    np.testing.assert_allclose(parsed, vector, rtol=1e-6)
+
+
+def test_matches_pgvector_text_format():
+    pgvector = pytest.importorskip("pgvector")
+    vector = np.random.default_rng(1).standard_normal(16).astype(np.float32)
+
+    parsed = pgvector.Vector.from_text(to_pgvector_literal(vector)).to_numpy()
+    np.testing.assert_allclose(parsed, vector, rtol=1e-6)